@@ -1,4 +1,5 @@
 import random
+from collections import Counter
 from datetime import datetime, timedelta
 from typing import Dict
 
@@ -125,7 +126,7 @@ class VetClinicDataGenerator:
 
         # Remove lunch breaks from availability
         for staff_id, staff in staff_roster.items():
-            lunch_end = staff.lunch_start + timedelta(hours=1)
+            lunch_end = staff.lunch_end
             lunch_slots = set()
             current_time = staff.lunch_start
             while current_time < lunch_end:
@@ -164,7 +165,7 @@ class VetClinicDataGenerator:
             # Find available staff member
             available_staff = [
                 staff_id for staff_id, staff in staff_roster.items()
-                if visit_type in staff.capabilities
+                if visit_type in staff.capability_set
                    and time_slot in staff_availability[staff_id]
             ]
 
@@ -235,15 +236,10 @@ def test_data_generation():
 
     # Print summary statistics
     total_appointments = len(schedule)
-    appointment_types = {}
-    species_counts = {}
-    staff_workload = {}
-
-    for slot in schedule.values():
-        if slot.species != "break":
-            appointment_types[slot.visit_type] = appointment_types.get(slot.visit_type, 0) + 1
-            species_counts[slot.species] = species_counts.get(slot.species, 0) + 1
-            staff_workload[slot.staff_id] = staff_workload.get(slot.staff_id, 0) + 1
+    appointments = [slot for slot in schedule.values() if slot.species != "break"]
+    appointment_types = dict(Counter(slot.visit_type for slot in appointments))
+    species_counts = dict(Counter(slot.species for slot in appointments))
+    staff_workload = dict(Counter(slot.staff_id for slot in appointments))
 
     summary = {
         'total_staff': len(staff_roster),
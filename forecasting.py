@@ -13,6 +13,7 @@ class ServiceDemandForecasting:
     def __init__(self, schedule: Dict[datetime, 'TimeSlot']):
         self.schedule = schedule
         self.historical_patterns = self._analyze_historical_patterns()
+        self._forecasts = {}
 
     def _analyze_historical_patterns(self) -> Dict:
         """Analyze historical appointment patterns"""
@@ -23,28 +24,30 @@ class ServiceDemandForecasting:
             'concurrent_services': defaultdict(list)
         }
 
-        for time, slot in self.schedule.items():
+        # Start times and service names for every slot, computed once for the concurrency scan
+        services = np.array([slot.visit_type.value for slot in self.schedule.values()], dtype=object)
+        start_seconds = np.array([time.timestamp() for time in self.schedule], dtype=float)
+
+        for index, (time, slot) in enumerate(self.schedule.items()):
             hour = time.hour
-            service = slot.visit_type.value
+            service = services[index]
             duration = (slot.end_time - slot.start_time).total_seconds() / 3600  # in hours
 
             patterns['hourly_demand'][hour][service] += 1
             patterns['service_popularity'][service] += 1
             patterns['typical_duration'][service].append(duration)
 
-            # Track concurrent services
-            concurrent_services = [
-                other_slot.visit_type.value
-                for other_time, other_slot in self.schedule.items()
-                if abs((other_time - time).total_seconds()) < 1800  # within 30 minutes
-                   and other_slot.visit_type.value != service
-            ]
-            patterns['concurrent_services'][service].extend(concurrent_services)
+            # Track concurrent services within 30 minutes
+            concurrent = (np.abs(start_seconds - start_seconds[index]) < 1800) & (services != service)
+            patterns['concurrent_services'][service].extend(services[concurrent].tolist())
 
         return patterns
 
     def forecast_demand(self, horizon_days: int = 7) -> Dict:
-        """Generate demand forecast for specified horizon"""
+        """Generate demand forecast for specified horizon, memoised per horizon"""
+        if horizon_days in self._forecasts:
+            return self._forecasts[horizon_days]
+
         forecast = {
             'daily_demand': {},
             'service_growth': {},
@@ -56,15 +59,20 @@ class ServiceDemandForecasting:
         total_appointments = sum(self.historical_patterns['service_popularity'].values())
         hours_analyzed = len(set(hour for hour in self.historical_patterns['hourly_demand'].keys()))
 
-        for service, count in self.historical_patterns['service_popularity'].items():
-            # Calculate daily rate and variation
-            daily_rate = count / (hours_analyzed / 8)  # Assuming 8-hour days
+        # Calculate daily rates, then every service's daily demand forecast with
+        # confidence intervals in one pass
+        service_popularity = self.historical_patterns['service_popularity']
+        daily_rates = {
+            service: count / (hours_analyzed / 8)  # Assuming 8-hour days
+            for service, count in service_popularity.items()
+        }
+        daily_forecasts = self._generate_daily_forecasts(
+            np.fromiter(daily_rates.values(), dtype=float, count=len(daily_rates)),
+            horizon_days
+        )
 
-            # Generate daily demand forecast with confidence intervals
-            forecast['daily_demand'][service] = self._generate_daily_forecast(
-                daily_rate,
-                horizon_days
-            )
+        for (service, daily_rate), daily_forecast in zip(daily_rates.items(), daily_forecasts):
+            forecast['daily_demand'][service] = daily_forecast
 
             # Calculate service growth trend
             hourly_counts = [
@@ -85,39 +93,35 @@ class ServiceDemandForecasting:
                 growth_rate
             )
 
+        self._forecasts[horizon_days] = forecast
         return forecast
 
-    def _generate_daily_forecast(
+    def _generate_daily_forecasts(
             self,
-            daily_rate: float,
+            daily_rates: np.ndarray,
             horizon_days: int
-    ) -> Dict[str, List[float]]:
-        """Generate daily demand forecast with confidence intervals"""
+    ) -> List[Dict[str, List[float]]]:
+        """Generate daily demand forecasts with confidence intervals, one per daily rate"""
         # Use normal distribution for prediction intervals
-        std_dev = np.sqrt(daily_rate)  # Assuming Poisson-like variation
-
-        forecast = {
-            'mean': [],
-            'lower': [],
-            'upper': []
-        }
-
-        for day in range(horizon_days):
-            # Add slight trend and weekly seasonality
-            trend_factor = 1 + (day * 0.01)  # 1% daily growth
-            seasonality = 1 + (0.2 * np.sin(2 * np.pi * (day % 7) / 7))  # 20% weekly variation
-
-            mean_demand = daily_rate * trend_factor * seasonality
+        std_devs = np.sqrt(daily_rates)[:, None]  # Assuming Poisson-like variation
 
-            # Calculate confidence intervals
-            lower = max(0, mean_demand - 1.96 * std_dev)
-            upper = mean_demand + 1.96 * std_dev
+        # Add slight trend (1% daily growth) and 20% weekly seasonality, shared by every
+        # service and broadcast across them as a services x days matrix
+        days = np.arange(horizon_days)
+        trend_factor = 1 + (days * 0.01)
+        seasonality = 1 + (0.2 * np.sin(2 * np.pi * (days % 7) / 7))
 
-            forecast['mean'].append(mean_demand)
-            forecast['lower'].append(lower)
-            forecast['upper'].append(upper)
+        mean_demand = daily_rates[:, None] * trend_factor * seasonality
 
-        return forecast
+        # Calculate confidence intervals from one shared 95% margin per service
+        margins = 1.96 * std_devs
+        means = mean_demand.tolist()
+        lowers = np.maximum(0, mean_demand - margins).tolist()
+        uppers = (mean_demand + margins).tolist()
+        return [
+            {'mean': mean, 'lower': lower, 'upper': upper}
+            for mean, lower, upper in zip(means, lowers, uppers)
+        ]
 
     def _calculate_growth_rate(self, counts: List[int]) -> float:
         """Calculate service growth rate from historical data"""
@@ -141,8 +145,9 @@ class ServiceDemandForecasting:
         if not hourly_counts:
             return []
 
-        mean_count = np.mean(list(hourly_counts.values()))
-        std_count = np.std(list(hourly_counts.values()))
+        counts = np.array(list(hourly_counts.values()))
+        mean_count = counts.mean()
+        std_count = counts.std()
 
         return [
             hour for hour, count in hourly_counts.items()
@@ -184,27 +189,16 @@ class ServiceDemandForecasting:
 
         with col1:
             st.write("#### Projected Daily Demand")
-            demand_data = []
-            for service, demand in forecast['daily_demand'].items():
-                for day in range(len(demand['mean'])):
-                    demand_data.append({
-                        'Day': day + 1,
-                        'Service': service,
-                        'Demand': demand['mean'][day],
-                        'Lower CI': demand['lower'][day],
-                        'Upper CI': demand['upper'][day]
-                    })
-
-            demand_df = pd.DataFrame(demand_data)
             fig = go.Figure()
 
-            for service in forecast['daily_demand'].keys():
-                service_data = demand_df[demand_df['Service'] == service]
+            # Each service's forecast is already columnar, so traces take its lists directly
+            for service, demand in forecast['daily_demand'].items():
+                days = list(range(1, len(demand['mean']) + 1))
 
                 # Add mean line
                 fig.add_trace(go.Scatter(
-                    x=service_data['Day'],
-                    y=service_data['Demand'],
+                    x=days,
+                    y=demand['mean'],
                     name=f"{service} (mean)",
                     mode='lines',
                     line=dict(width=2)
@@ -212,16 +206,16 @@ class ServiceDemandForecasting:
 
                 # Add confidence interval
                 fig.add_trace(go.Scatter(
-                    x=service_data['Day'],
-                    y=service_data['Upper CI'],
+                    x=days,
+                    y=demand['upper'],
                     name=f"{service} (upper)",
                     mode='lines',
                     line=dict(width=0),
                     showlegend=False
                 ))
                 fig.add_trace(go.Scatter(
-                    x=service_data['Day'],
-                    y=service_data['Lower CI'],
+                    x=days,
+                    y=demand['lower'],
                     name=f"{service} (lower)",
                     mode='lines',
                     line=dict(width=0),
@@ -239,11 +233,10 @@ class ServiceDemandForecasting:
 
         with col2:
             st.write("#### Service Growth Trends")
-            growth_data = [
-                {'Service': service, 'Growth Rate': rate * 100}
-                for service, rate in forecast['service_growth'].items()
-            ]
-            growth_df = pd.DataFrame(growth_data)
+            growth_df = pd.DataFrame({
+                'Service': list(forecast['service_growth']),
+                'Growth Rate': [rate * 100 for rate in forecast['service_growth'].values()]
+            })
 
             fig = px.bar(
                 growth_df,
@@ -257,30 +250,25 @@ class ServiceDemandForecasting:
 
         # Display capacity recommendations
         st.write("#### Capacity Recommendations")
-        capacity_data = []
-        for service, capacity in forecast['recommended_capacity'].items():
-            capacity_data.append({
-                'Service': service,
-                'Daily Appointments': capacity['appointments_per_day'],
-                'Hours Required': capacity['hours_per_day'],
-                'Staff Required': capacity['recommended_staff']
-            })
-
-        capacity_df = pd.DataFrame(capacity_data)
+        capacities = list(forecast['recommended_capacity'].values())
+        capacity_df = pd.DataFrame({
+            'Service': list(forecast['recommended_capacity']),
+            'Daily Appointments': [capacity['appointments_per_day'] for capacity in capacities],
+            'Hours Required': [capacity['hours_per_day'] for capacity in capacities],
+            'Staff Required': [capacity['recommended_staff'] for capacity in capacities]
+        })
         st.table(capacity_df)
 
         # Display peak hour analysis
         st.write("#### Peak Hours Analysis")
-        peak_data = []
-        for service, peaks in forecast['peak_hours'].items():
-            peak_times = [f"{hour:02d}:00" for hour in sorted(peaks)]
-            peak_data.append({
-                'Service': service,
-                'Peak Hours': ", ".join(peak_times) if peak_times else "No clear peaks",
-                'Number of Peak Hours': len(peaks)
-            })
-
-        peak_df = pd.DataFrame(peak_data)
+        peak_df = pd.DataFrame({
+            'Service': list(forecast['peak_hours']),
+            'Peak Hours': [
+                ", ".join(f"{hour:02d}:00" for hour in sorted(peaks)) if peaks else "No clear peaks"
+                for peaks in forecast['peak_hours'].values()
+            ],
+            'Number of Peak Hours': [len(peaks) for peaks in forecast['peak_hours'].values()]
+        })
         st.table(peak_df)
 
 
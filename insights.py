@@ -21,6 +21,36 @@ class ScheduleInsights:
         self.schedule = schedule
         self.staff_roster = staff_roster
         self.potential_slots = potential_slots
+        self._slot_frame = None
+        self._staff_frame = None
+
+    def _slots(self) -> pd.DataFrame:
+        """Start-time indexed frame of the schedule (in schedule order), built once and shared by the analyses"""
+        if self._slot_frame is None:
+            slots = list(self.schedule.values())
+            start_times = pd.DatetimeIndex(list(self.schedule), name='start_time')
+            self._slot_frame = pd.DataFrame(
+                {
+                    'hour': start_times.hour,
+                    'duration': [(slot.end_time - slot.start_time).total_seconds() / 60 for slot in slots],
+                    'staff_id': [slot.staff_id for slot in slots]
+                },
+                index=start_times
+            )
+        return self._slot_frame
+
+    def _hourly_counts(self) -> Dict[int, int]:
+        """Appointments per hour, in order of first appearance in the schedule"""
+        return self._slots().groupby('hour', sort=False).size().to_dict()
+
+    def _staff_totals(self) -> pd.DataFrame:
+        """Appointment count and booked minutes per staff member, in order of first appearance"""
+        if self._staff_frame is None:
+            self._staff_frame = self._slots().groupby('staff_id', sort=False)['duration'].agg(
+                appointments='size',
+                minutes='sum'
+            )
+        return self._staff_frame
 
     def analyze_schedule(self) -> Dict[str, List[Tuple[str, str]]]:
         """Analyze schedule and return insights with suggestions"""
@@ -192,30 +222,25 @@ class ScheduleInsights:
 
         # Display service utilization
         st.write("#### Service Type Utilization")
-        specialty_data = [
-            {'Service': specialty, 'Appointments': count}
-            for specialty, count in metrics['specialty_utilization'].items()
-        ]
-
-        if specialty_data:
-            specialty_df = pd.DataFrame(specialty_data)
+        if metrics['specialty_utilization']:
+            specialty_df = pd.DataFrame({
+                'Service': list(metrics['specialty_utilization']),
+                'Appointments': list(metrics['specialty_utilization'].values())
+            })
             fig = px.bar(specialty_df, x='Service', y='Appointments',
                          title='Appointments by Service Type')
             st.plotly_chart(fig, use_container_width=True)
 
         # Display staff service usage
         st.write("#### Staff Service Distribution")
-        staff_service_data = []
-        for staff_id, services in metrics['staff_specialty_load'].items():
-            for service, count in services.items():
-                staff_service_data.append({
-                    'Staff': staff_id,
-                    'Service': service,
-                    'Appointments': count
-                })
-
-        if staff_service_data:
-            staff_df = pd.DataFrame(staff_service_data)
+        staff_load = [
+            (staff_id, service, count)
+            for staff_id, services in metrics['staff_specialty_load'].items()
+            for service, count in services.items()
+        ]
+
+        if staff_load:
+            staff_df = pd.DataFrame(staff_load, columns=['Staff', 'Service', 'Appointments'])
             fig = px.bar(staff_df, x='Staff', y='Appointments', color='Service',
                          title='Staff Service Distribution')
             st.plotly_chart(fig, use_container_width=True)
@@ -236,15 +261,18 @@ class ScheduleInsights:
         for hour in hours:
             hour_coverage = metrics['hourly_coverage'][hour]
             for service in services:
-                complete_hourly_data.append({
-                    'Hour': f"{hour:02d}:00",
-                    'Service': service,
-                    'Appointments': hour_coverage.get(service, 0),
-                    'Hour_num': hour  # For sorting
-                })
+                complete_hourly_data.append((
+                    f"{hour:02d}:00",
+                    service,
+                    hour_coverage.get(service, 0),
+                    hour  # For sorting
+                ))
 
         if complete_hourly_data:
-            hourly_df = pd.DataFrame(complete_hourly_data)
+            hourly_df = pd.DataFrame(
+                complete_hourly_data,
+                columns=['Hour', 'Service', 'Appointments', 'Hour_num']
+            )
 
             # Create heatmap
             pivot_df = hourly_df.pivot(
@@ -304,9 +332,7 @@ class ScheduleInsights:
 
     def _analyze_peak_hours(self, insights: Dict):
         """Analyze peak hours and suggest optimizations"""
-        hourly_count = defaultdict(int)
-        for time in self.schedule:
-            hourly_count[time.hour] += 1
+        hourly_count = self._hourly_counts()
 
         # Find peak hours
         peak_hours = []
@@ -322,13 +348,10 @@ class ScheduleInsights:
 
     def _analyze_appointment_duration(self, insights: Dict):
         """Analyze appointment durations and suggest optimizations"""
-        durations = []
-        for slot in self.schedule.values():
-            duration = (slot.end_time - slot.start_time).total_seconds() / 60
-            durations.append(duration)
+        durations = self._slots()['duration']
 
-        if durations:
-            avg_duration = sum(durations) / len(durations)
+        if len(durations):
+            avg_duration = durations.mean()
             if avg_duration > 45:
                 insights["optimization"].append((
                     "Long Appointments",
@@ -338,11 +361,7 @@ class ScheduleInsights:
     def _analyze_schedule_risks(self, insights: Dict):
         """Analyze potential schedule risks"""
         # Check for back-to-back complex appointments
-        complex_appointments = 0
-        for slot in self.schedule.values():
-            duration = (slot.end_time - slot.start_time).total_seconds() / 60
-            if duration >= 45:
-                complex_appointments += 1
+        complex_appointments = int((self._slots()['duration'] >= 45).sum())
 
         if complex_appointments > len(self.staff_roster) * 2:
             insights["risk"].append((
@@ -352,9 +371,7 @@ class ScheduleInsights:
 
     def _analyze_time_distribution(self, insights: Dict):
         """Analyze distribution of appointments throughout the day"""
-        hourly_count = defaultdict(int)
-        for time in self.schedule:
-            hourly_count[time.hour] += 1
+        hourly_count = self._hourly_counts()
 
         # Check for uneven distribution
         max_hour = max(hourly_count.values(), default=0)
@@ -421,13 +438,9 @@ class ScheduleInsights:
 
     def _analyze_staff_workload(self, insights: Dict):
         """Analyze workload distribution among staff"""
-        staff_appointments = defaultdict(int)
-        staff_duration = defaultdict(int)
-
-        for slot in self.schedule.values():
-            staff_appointments[slot.staff_id] += 1
-            duration = (slot.end_time - slot.start_time).total_seconds() / 60
-            staff_duration[slot.staff_id] += duration
+        staff_totals = self._staff_totals()
+        staff_appointments = staff_totals['appointments'].to_dict()
+        staff_duration = staff_totals['minutes'].to_dict()
 
         # Check workload balance
         max_appointments = max(staff_appointments.values())
@@ -519,10 +532,7 @@ class ScheduleInsights:
     def _calculate_efficiency_score(self) -> int:
         """Calculate schedule efficiency score"""
         score = 100
-        hourly_count = defaultdict(int)
-
-        for time in self.schedule:
-            hourly_count[time.hour] += 1
+        hourly_count = self._hourly_counts()
 
         # Penalize for uneven distribution
         max_hour = max(hourly_count.values(), default=0)
@@ -534,10 +544,7 @@ class ScheduleInsights:
     def _calculate_workload_score(self) -> int:
         """Calculate workload balance score"""
         score = 100
-        staff_appointments = defaultdict(int)
-
-        for slot in self.schedule.values():
-            staff_appointments[slot.staff_id] += 1
+        staff_appointments = self._staff_totals()['appointments'].to_dict()
 
         if staff_appointments:
             max_appointments = max(staff_appointments.values())
@@ -564,11 +571,7 @@ class ScheduleInsights:
     def _calculate_risk_score(self) -> int:
         """Calculate schedule risk score"""
         score = 100
-        staff_duration = defaultdict(int)
-
-        for slot in self.schedule.values():
-            duration = (slot.end_time - slot.start_time).total_seconds() / 60
-            staff_duration[slot.staff_id] += duration
+        staff_duration = self._staff_totals()['minutes'].to_dict()
 
         for duration in staff_duration.values():
             if duration > 420:  # 7 hours
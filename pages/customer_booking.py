@@ -2,6 +2,7 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
+from functools import lru_cache
 from typing import List, Optional, Dict, Set
 
 import streamlit as st
@@ -20,14 +21,14 @@ class Veterinarian:
 
     def is_available(self, time_slot: datetime) -> bool:
         """Check if vet is available at given time slot."""
-        date_key = time_slot.date().isoformat()
+        date_key = _date_key(time_slot)
         if date_key not in self.schedule:
             return True
         return len(self.schedule[date_key]) < self.max_daily_appointments
 
     def book_appointment(self, time_slot: datetime):
         """Book an appointment for the vet."""
-        date_key = time_slot.date().isoformat()
+        date_key = _date_key(time_slot)
         if date_key not in self.schedule:
             self.schedule[date_key] = []
         self.schedule[date_key].append(time_slot)
@@ -72,6 +73,19 @@ class AppointmentType(Enum):
     DENTAL = "dental"
     SPECIALTY_CONSULT = "specialty_consult"
 
+_APPOINTMENT_TYPE_VALUES = tuple(type.value for type in AppointmentType)
+_PET_TYPE_VALUES = tuple(type.value for type in PetType)
+
+@lru_cache(maxsize=1024)
+def _format_datetime(value: datetime) -> str:
+    """Format an appointment datetime for display, memoised across reruns"""
+    return value.strftime('%Y-%m-%d %H:%M')
+
+@lru_cache(maxsize=1024)
+def _date_key(value: datetime) -> str:
+    """Schedule and waiting-list key for the day of a datetime, memoised across calls"""
+    return value.date().isoformat()
+
 class Season(Enum):
     SPRING = "spring"
     SUMMER = "summer"
@@ -129,8 +143,9 @@ class CapacityPlanner:
 
     def check_capacity(self, date: datetime) -> Dict:
         """Check clinic capacity for a given date."""
+        date_key = _date_key(date)
         total_slots = sum(v.max_daily_appointments for v in self.vets)
-        booked_slots = sum(len(v.schedule.get(date.date().isoformat(), [])) for v in self.vets)
+        booked_slots = sum(len(v.schedule.get(date_key, [])) for v in self.vets)
 
         utilization = booked_slots / total_slots
         can_overbook = utilization >= self.overbooking_threshold
@@ -139,7 +154,7 @@ class CapacityPlanner:
             'utilization': utilization,
             'available_regular_slots': total_slots - booked_slots,
             'can_overbook': can_overbook,
-            'waiting_list_length': len(self.waiting_lists[date.date().isoformat()]),
+            'waiting_list_length': len(self.waiting_lists[date_key]),
             'recommended_action': self._get_capacity_recommendation(utilization)
         }
 
@@ -234,6 +249,11 @@ class SeasonalPricingEngine:
         }
         return weather_multipliers.get(season, 1.0)
 
+@st.cache_resource
+def _seasonal_pricing_engine() -> SeasonalPricingEngine:
+    """Shared pricing engine; its tables are constant, so one instance serves every rerun"""
+    return SeasonalPricingEngine()
+
 def get_appointment_options(
     client_preferred_time: datetime,
     appointment_type: AppointmentType,
@@ -273,7 +293,7 @@ def get_appointment_options(
     # Initialize handlers
     emergency_handler = EmergencyHandler(vets)
     capacity_planner = CapacityPlanner(vets)
-    seasonal_pricing = SeasonalPricingEngine()
+    seasonal_pricing = _seasonal_pricing_engine()
     options = []
 
     # Handle emergency cases
@@ -371,7 +391,7 @@ def get_appointment_options(
             message="Overbooked slot - may experience delays",
             estimated_duration=30,
             waiting_list_position=len(capacity_planner.waiting_lists[
-                client_preferred_time.date().isoformat()
+                _date_key(client_preferred_time)
             ]) + 1
         ))
 
@@ -426,12 +446,12 @@ def main():
         # Basic appointment details
         appointment_type = st.selectbox(
             "Appointment Type",
-            options=[type.value for type in AppointmentType]
+            options=_APPOINTMENT_TYPE_VALUES
         )
 
         pet_type = st.selectbox(
             "Pet Type",
-            options=[type.value for type in PetType]
+            options=_PET_TYPE_VALUES
         )
 
         # Date and time selection
@@ -499,7 +519,7 @@ def main():
             if options:
                 for i, option in enumerate(options, 1):
                     with st.expander(f"Option {i}: Dr. {option.vet.name} - ${option.price:.2f}"):
-                        st.write(f"**Date/Time:** {option.datetime.strftime('%Y-%m-%d %H:%M')}")
+                        st.write(f"**Date/Time:** {_format_datetime(option.datetime)}")
                         st.write(f"**Duration:** {option.estimated_duration} minutes")
                         if option.discount:
                             st.write(f"**Promotions:** {option.discount}")
@@ -522,13 +542,15 @@ def main():
             for i, apt in enumerate(st.session_state.appointments, 1):
                 if apt is not None and hasattr(apt, 'datetime'):
                     with st.expander(f"Appointment {i}"):
-                        st.write(f"**Date:** {apt.datetime.strftime('%Y-%m-%d %H:%M')}")
+                        st.write(f"**Date:** {_format_datetime(apt.datetime)}")
                         st.write(f"**Doctor:** Dr. {apt.vet.name}")
                         st.write(f"**Price:** ${apt.price:.2f}")
                         st.write(f"**Duration:** {apt.estimated_duration} minutes")
                         if st.button("Cancel Appointment", key=f"cancel_{i}"):
-                            st.session_state.appointments.remove(apt)
-                            st.success("Appointment cancelled successfully!")
+                            # Delete by position rather than an equality scan over every booking
+                            del st.session_state.appointments[i - 1]
+                            st.toast("Appointment cancelled successfully!")
+                            st.rerun()
         else:
             st.info("No appointments booked yet.")
 
@@ -1,19 +1,75 @@
+import pickle
 import random
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+from plotly.subplots import make_subplots
 import streamlit as st
 
 from clinic_data_generator import test_data_generation
 from forecasting import ServiceDemandForecasting
 from insights import ScheduleInsights
-from schedule import AdvancedTimeSlotGenerator, Staff, TimeSlot, Pet, Customer, \
-    get_three_best_appointments, test_advanced_scheduler
+from schedule import AdvancedTimeSlotGenerator, Staff, TimeSlot, Pet, Customer, ScheduleArrays, \
+    RELIABILITY_SCORES, get_three_best_appointments, test_advanced_scheduler
 from visit_type import VisitType
 
+_VISIT_TYPES = tuple(VisitType)
+_VISIT_TYPE_LABELS = {visit_type: visit_type.value for visit_type in _VISIT_TYPES}
+_VISIT_TYPE_VALUES = tuple(_VISIT_TYPE_LABELS.values())
+_DUMMY_SPECIES = ("canine", "feline", "avian", "exotic")
+_SPECIES_OPTIONS = ("Canine", "Feline", "Avian", "Exotic")
+_SLOT_FIELDS = attrgetter('staff_id', 'start_time', 'end_time', 'visit_type', 'species')
+
+_CACHE_DIR = Path(".streamlit_cache")
+
+
+@lru_cache(maxsize=1024)
+def _format_time(time: datetime) -> str:
+    """Format a time as e.g. '09:30 AM', memoised across reruns"""
+    return time.strftime('%I:%M %p')
+
+
+def _load_cached(day: date) -> Optional[Tuple]:
+    """Load the clinic data snapshot saved for the given day, if any"""
+    path = _CACHE_DIR / f"{day.isoformat()}.pkl"
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # Stale or unreadable snapshot, fall back to regenerating
+        return None
+
+
+def _save_cached(day: date, clinic_data: Tuple) -> None:
+    """Persist the clinic data snapshot for the given day, replacing any older snapshots"""
+    _CACHE_DIR.mkdir(exist_ok=True)
+    path = _CACHE_DIR / f"{day.isoformat()}.pkl"
+    for stale in _CACHE_DIR.glob("*.pkl"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+    with path.open("wb") as f:
+        pickle.dump(clinic_data, f)
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _clinic_data(day: date) -> Tuple:
+    """Clinic data for the given day, loaded from its snapshot (or generated) once and shared across reruns"""
+    clinic_data = _load_cached(day)
+    if clinic_data is None:
+        clinic_data = test_data_generation()
+        _save_cached(day, clinic_data)
+    return clinic_data
+
 
 def generate_dummy_schedule(
         generator: AdvancedTimeSlotGenerator,
@@ -23,25 +79,43 @@ def generate_dummy_schedule(
     """Generate realistic dummy schedule data"""
     schedule = {}
     start_date = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
-    species_list = ["canine", "feline", "avian", "exotic"]
+
+    # Draw every visit type and species up front in one call each
+    visit_type_draws = random.choices(_VISIT_TYPES, k=num_appointments)
+    species_draws = random.choices(_DUMMY_SPECIES, k=num_appointments)
 
     # Create dummy pet for slot generation
     dummy_pet = Pet("dummy", "canine", 0.5, [])
 
+    # Candidate times per visit type, generated once and then drawn from greedily.
+    # Bookings only ever rule slots out, so a drawn candidate that is no longer open
+    # is discarded and another drawn, which keeps the choice uniform over open slots.
+    candidates = {}
+
     # Generate some appointments
-    for _ in range(num_appointments):
-        visit_type = random.choice(list(VisitType))
-        potential_slots = generator.generate_potential_slots(
-            schedule,
-            staff_roster,
-            visit_type,
-            dummy_pet,
-            start_date
-        )
+    for visit_type, species in zip(visit_type_draws, species_draws):
+        if visit_type not in candidates:
+            candidates[visit_type] = generator.generate_potential_slots(
+                schedule,
+                staff_roster,
+                visit_type,
+                dummy_pet,
+                start_date
+            )
+        potential_slots = candidates[visit_type]
+        duration = generator.get_appointment_details(start_date, visit_type, dummy_pet)['duration']
+
+        time = None
+        while potential_slots:
+            index = random.randrange(len(potential_slots))
+            potential_slots[index], potential_slots[-1] = potential_slots[-1], potential_slots[index]
+            candidate = potential_slots.pop()
+            if generator._is_slot_open(candidate, duration, staff_roster, schedule, visit_type):
+                time = candidate
+                break
 
-        if potential_slots:
-            time = random.choice(potential_slots)
-            details =  generator.get_appointment_details(time, visit_type, dummy_pet)
+        if time is not None:
+            details = generator.get_appointment_details(time, visit_type, dummy_pet)
 
             # Find available staff
             available_staff = list(generator._check_staff_availability(
@@ -58,7 +132,7 @@ def generate_dummy_schedule(
                     details['end_time'],
                     visit_type,
                     random.choice(available_staff),
-                    random.choice(species_list)
+                    species
                 )
 
     return schedule
@@ -67,53 +141,61 @@ def generate_dummy_schedule(
 def generate_dummy_data():
     """Generate dummy data with a dense schedule."""
 
+    now = datetime.now()
+
     # Generate staff roster with staggered lunch breaks
     staff_roster = {
         "Dr. Smith": Staff(
             "Dr. Smith",
             [VisitType.VACCINATION, VisitType.WELLNESS, VisitType.CONSULT, VisitType.SURGERY],
-            datetime.now().replace(hour=12, minute=0)
+            now.replace(hour=12, minute=0)
         ),
         "Dr. Johnson": Staff(
             "Dr. Johnson",
             [VisitType.DENTAL, VisitType.SURGERY, VisitType.SPECIALTY],
-            datetime.now().replace(hour=13, minute=0)
+            now.replace(hour=13, minute=0)
         ),
         "Nurse Williams": Staff(
             "Nurse Williams",
             [VisitType.VACCINATION, VisitType.WELLNESS, VisitType.GROOMING],
-            datetime.now().replace(hour=11, minute=0)
+            now.replace(hour=11, minute=0)
         )
     }
 
     # Generate dense schedule
     schedule = {}
-    current_date = datetime.now().replace(hour=9, minute=0, second=0, microsecond=0)
-    visit_types = list(VisitType)
-    species_list = ["Canine", "Feline", "Avian", "Exotic"]
-
-    # Create time slots every 30 minutes for each staff member
-    for hour in range(9, 17):  # 9 AM to 5 PM
-        for minute in [0, 30]:  # Every 30 minutes
-            time = current_date.replace(hour=hour, minute=minute)
-
-            # Try to schedule each staff member
-            for staff_id, staff in staff_roster.items():
-                # Skip if during lunch hour
-                if time.hour != staff.lunch_start.hour:
-                    # 90% chance of booking (high density)
-                    if random.random() < 0.9:
-                        # Select appropriate visit type for staff
-                        available_types = list(staff.capabilities)
-                        visit_type = random.choice(available_types)
-
-                        schedule[time] = TimeSlot(
-                            time,
-                            time + timedelta(minutes=30),
-                            visit_type,
-                            staff_id,
-                            random.choice(species_list)
-                        )
+    current_date = now.replace(hour=9, minute=0, second=0, microsecond=0)
+    species_list = _SPECIES_OPTIONS
+
+    # Visit types each staff member can be booked for, and their lunch hours
+    staff_types = [
+        (staff_id, tuple(staff.capabilities), staff.lunch_start.hour)
+        for staff_id, staff in staff_roster.items()
+    ]
+    # One species draw per (slot, staff) pair, consumed in loop order
+    species_draws = iter(random.choices(species_list, k=16 * len(staff_types)))
+
+    # Create time slots every 30 minutes (9 AM to 5 PM) for each staff member
+    slot_length = timedelta(minutes=30)
+    for slot_index in range(16):
+        time = current_date + slot_index * slot_length
+        end_time = time + slot_length
+
+        # Try to schedule each staff member
+        for staff_id, available_types, lunch_hour in staff_types:
+            species = next(species_draws)
+            # Skip lunch hour; otherwise 90% chance of booking (high density)
+            if time.hour != lunch_hour and random.random() < 0.9:
+                # Select appropriate visit type for staff
+                visit_type = random.choice(available_types)
+
+                schedule[time] = TimeSlot(
+                    time,
+                    end_time,
+                    visit_type,
+                    staff_id,
+                    species
+                )
 
     # Generate expiring inventory
     expiring_inventory = {
@@ -131,68 +213,323 @@ def generate_dummy_data():
         'total_slots': total_possible_slots,
         'booked_slots': actual_bookings,
         'utilization': utilization,
-        'appointments_by_type': {},
-        'appointments_by_staff': {}
+        # Appointment distributions by type and by staff
+        'appointments_by_type': dict(Counter(_VISIT_TYPE_LABELS[slot.visit_type] for slot in schedule.values())),
+        'appointments_by_staff': dict(Counter(slot.staff_id for slot in schedule.values()))
     }
 
-    # Calculate appointment distributions
-    for slot in schedule.values():
-        # Count by type
-        visit_type = slot.visit_type.value
-        summary['appointments_by_type'][visit_type] = summary['appointments_by_type'].get(visit_type, 0) + 1
+    return staff_roster, schedule, expiring_inventory, summary
 
-        # Count by staff
-        staff_id = slot.staff_id
-        summary['appointments_by_staff'][staff_id] = summary['appointments_by_staff'].get(staff_id, 0) + 1
 
-    return staff_roster, schedule, expiring_inventory, summary
+@st.cache_data(show_spinner=False, max_entries=64)
+def _best_appointment_times(
+        inputs_key: Tuple,
+        _schedule: Dict[datetime, TimeSlot],
+        _staff_roster: Dict[str, Staff],
+        _visit_type: VisitType,
+        _customer: Customer,
+        _pet: Pet,
+        _expiring_inventory: Dict,
+        _potential_slots: List[datetime],
+        _time_slot_generator: AdvancedTimeSlotGenerator
+) -> List[datetime]:
+    """
+    get_three_best_appointments cached across reruns. Only inputs_key, a hashable
+    snapshot of every input, is hashed; the underscored objects are what it describes.
+    """
+    return get_three_best_appointments(
+        _schedule,
+        _staff_roster,
+        _visit_type,
+        _customer,
+        _pet,
+        _expiring_inventory,
+        _potential_slots,
+        _time_slot_generator
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _potential_slots(
+        inputs_key: Tuple,
+        _schedule: Dict[datetime, TimeSlot],
+        _staff_roster: Dict[str, Staff],
+        _visit_type: VisitType,
+        _pet: Pet,
+        _start_date: datetime,
+        _time_slot_generator: AdvancedTimeSlotGenerator
+) -> List[datetime]:
+    """
+    generate_potential_slots cached across reruns, keyed on inputs_key (a hashable
+    snapshot of the schedule, roster, visit type, pet duration inputs and start hour)
+    """
+    return _time_slot_generator.generate_potential_slots(
+        _schedule,
+        _staff_roster,
+        _visit_type,
+        _pet,
+        _start_date
+    )
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _demand_forecasting(schedule_key: Tuple, _schedule: Dict[datetime, TimeSlot]) -> ServiceDemandForecasting:
+    """Demand forecaster for a schedule, shared across reruns while schedule_key is unchanged"""
+    return ServiceDemandForecasting(_schedule)
+
 
 def create_schedule_gantt(schedule):
     """Create a Gantt chart of the daily schedule."""
-    df_schedule = []
-
-    for time, slot in schedule.items():
-        df_schedule.append({
-            'Task': slot.staff_id,
-            'Start': slot.start_time,
-            'Finish': slot.end_time,
-            'Type': slot.visit_type.value,
-            'Species': slot.species
-        })
-
-    if df_schedule:
-        df = pd.DataFrame(df_schedule)
-        fig = px.timeline(df, x_start="Start", x_end="Finish", y="Task", color="Type",
-                          title="Daily schedule",
-                          labels={"Task": "Staff member", "Type": "Visit type"})
-        fig.update_layout(height=300)
-        return fig
-    return None
+    if not schedule:
+        return None
+
+    # Extract slot fields in one C-level pass; the rows double as the cache fingerprint
+    rows = tuple(map(_SLOT_FIELDS, schedule.values()))
+
+    # Reuse the last figure if the schedule hasn't changed since the previous rerun
+    cached = st.session_state.get('_gantt_cache')
+    if cached is not None and cached[0] == rows:
+        return cached[1]
+
+    # Group rows by visit type (in first-seen order) so each type is one bar trace
+    rows_by_type = {}
+    for row in rows:
+        rows_by_type.setdefault(row[3], []).append(row)
+
+    colors = px.colors.qualitative.Plotly
+    fig = go.Figure()
+    for i, (visit_type, type_rows) in enumerate(rows_by_type.items()):
+        staff_ids, start_times, end_times, _, _ = zip(*type_rows)
+        fig.add_trace(go.Bar(
+            y=staff_ids,
+            base=start_times,
+            x=[(end - start).total_seconds() * 1000 for start, end in zip(start_times, end_times)],
+            customdata=end_times,
+            orientation='h',
+            name=_VISIT_TYPE_LABELS[visit_type],
+            marker_color=colors[i % len(colors)],
+            hovertemplate="Staff member=%{y}<br>Start=%{base}<br>Finish=%{customdata}<extra>%{fullData.name}</extra>"
+        ))
+
+    fig.update_xaxes(type='date')
+    fig.update_layout(
+        title="Daily schedule",
+        height=300,
+        barmode='overlay',
+        legend_title_text="Visit type",
+        yaxis_title="Staff member"
+    )
+
+    st.session_state['_gantt_cache'] = (rows, fig)
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _score_breakdown_figure(
+        all_score_items: Tuple[Tuple[Tuple[str, float], ...], ...],
+        titles: Tuple[str, ...],
+        category_maximums: Tuple[Tuple[str, int], ...],
+        category_descriptions: Tuple[Tuple[str, str], ...]
+) -> go.Figure:
+    """Build one figure with a score breakdown bar chart per option, cached on its (hashable) inputs"""
+    maximums = dict(category_maximums)
+    descriptions = dict(category_descriptions)
+
+    rows = max(1, len(all_score_items))
+    fig = make_subplots(
+        rows=rows,
+        cols=1,
+        subplot_titles=titles,
+        shared_xaxes=True,
+        vertical_spacing=0.08
+    )
+
+    # Every option's components come in the same category order, so the category
+    # labels, maximum bars and their hover text are built once for all rows
+    categories = [cat for cat, _ in all_score_items[0]] if all_score_items else []
+    category_maximum = [maximums[cat] for cat in categories]
+    maximum_hovertext = [descriptions[cat] for cat in categories]
+
+    for row, score_items in enumerate(all_score_items, 1):
+        scores = [score for _, score in score_items]
+
+        # Add bars for maximum possible scores (lighter color)
+        fig.add_trace(go.Bar(
+            y=categories,
+            x=category_maximum,
+            name='Maximum Possible',
+            legendgroup='Maximum Possible',
+            showlegend=row == 1,
+            orientation='h',
+            marker_color='lightgray',
+            hovertext=maximum_hovertext,
+            hoverinfo='text'
+        ), row=row, col=1)
+
+        # Add bars for actual scores
+        fig.add_trace(go.Bar(
+            y=categories,
+            x=scores,
+            name='Actual Score',
+            legendgroup='Actual Score',
+            showlegend=row == 1,
+            orientation='h',
+            marker_color='#1f77b4',
+            hovertext=[f"{score:.1f}/{max_score}" for score, max_score in zip(scores, category_maximum)],
+            hoverinfo='text'
+        ), row=row, col=1)
+
+    fig.update_xaxes(title_text='Points', row=rows, col=1)
+    fig.update_layout(
+        barmode='overlay',
+        height=60 + 340 * rows,
+        margin=dict(l=20, r=20, t=40, b=20),
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def _comparison_figure(
+        all_score_items: Tuple[Tuple[datetime, Tuple[Tuple[str, float], ...]], ...],
+        categories: Tuple[str, ...]
+) -> go.Figure:
+    """Build the time slot comparison radar chart, cached on its (hashable) inputs across reruns"""
+    fig = go.Figure()
+
+    if all_score_items:
+        # Options x categories score matrix, with columns permuted once from the score
+        # components' order into the chart's category order
+        positions = {cat: index for index, (cat, _) in enumerate(all_score_items[0][1])}
+        score_matrix = np.array(
+            [[score for _, score in score_items] for _, score_items in all_score_items],
+            dtype=float
+        )[:, [positions[cat] for cat in categories]]
+        theta = list(categories)
+
+        for i, ((time, _), row) in enumerate(zip(all_score_items, score_matrix)):
+            fig.add_trace(go.Scatterpolar(
+                r=row,
+                theta=theta,
+                name=f"Option {i + 1}: {_format_time(time)}",
+                fill='toself'
+            ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 20]
+            )
+        ),
+        showlegend=True,
+        height=500,
+        title="Comparison of Time Slot Scores"
+    )
+
+    return fig
 
 
 class ScoreVisualizer:
+    SCORE_CATEGORIES = {
+        'Staff Availability': 30,
+        'Preferred Time': 22,
+        'Health Complexity': 12,
+        'Customer reliability': 22,
+        'Expiring inventory': 14,
+        'Species Alignment': 8,
+        'Break time': 8,
+        'Visit Type Alignment': 5
+    }
+
+    CATEGORY_DESCRIPTIONS = {
+        'Staff Availability': 'Score based on available qualified staff',
+        'Visit Type Alignment': 'Score based on similar appointments nearby',
+        'Species Alignment': 'Score based on similar species nearby',
+        'Health Complexity': 'Score based on adequate time allocation',
+        'Preferred Time': 'Score based on optimal time of day',
+        'Expiring inventory': 'Score based on inventory optimization',
+        'Customer reliability': 'Score based on client history',
+        'Break time': 'Score based on optimal spacing'
+    }
+
+    # Hashable views of the constants above, built once for the cached figure builders
+    _CATEGORIES = tuple(SCORE_CATEGORIES)
+    _CATEGORY_ITEMS = tuple(SCORE_CATEGORIES.items())
+    _DESCRIPTION_ITEMS = tuple(CATEGORY_DESCRIPTIONS.items())
+    _CATEGORY_LABELS = {category: category.lower() for category in SCORE_CATEGORIES}
+
     def __init__(self):
-        self.score_categories = {
-            'Staff Availability': 30,
-            'Preferred Time': 22,
-            'Health Complexity': 12,
-            'Customer reliability': 22,
-            'Expiring inventory': 14,
-            'Species Alignment': 8,
-            'Break time': 8,
-            'Visit Type Alignment': 5
-        }
-
-        self.category_descriptions = {
-            'Staff Availability': 'Score based on available qualified staff',
-            'Visit Type Alignment': 'Score based on similar appointments nearby',
-            'Species Alignment': 'Score based on similar species nearby',
-            'Health Complexity': 'Score based on adequate time allocation',
-            'Preferred Time': 'Score based on optimal time of day',
-            'Expiring inventory': 'Score based on inventory optimization',
-            'Customer reliability': 'Score based on client history',
-            'Break time': 'Score based on optimal spacing'
-        }
+        self._cached_schedule = None
+        self._cached_arrays = None
+        self._cached_roster = None
+        self._availability_cache = {}
+        self._neighbour_cache = {}
+
+    def _schedule_arrays(self, schedule: Dict) -> ScheduleArrays:
+        """Return the array view of a schedule, rebuilt only when the schedule changes"""
+        if (
+                self._cached_schedule is not schedule
+                or len(self._cached_arrays.times) != len(schedule)
+        ):
+            self._cached_schedule = schedule
+            self._cached_arrays = ScheduleArrays.from_schedule(schedule)
+            self._availability_cache = {}
+            self._neighbour_cache = {}
+        return self._cached_arrays
+
+    def _available_staff_count(
+            self,
+            time: datetime,
+            duration: int,
+            staff_roster: Dict,
+            schedule: Dict,
+            visit_type: 'VisitType',
+            time_slot_generator: 'AdvancedTimeSlotGenerator'
+    ) -> int:
+        """Number of staff free for an appointment, memoised per schedule and roster"""
+        if self._cached_roster is not staff_roster:
+            self._cached_roster = staff_roster
+            self._availability_cache = {}
+
+        key = (time, duration, visit_type)
+        if key not in self._availability_cache:
+            self._availability_cache[key] = len(time_slot_generator._check_staff_availability(
+                time,
+                duration,
+                staff_roster,
+                schedule,
+                visit_type
+            ))
+        return self._availability_cache[key]
+
+    def _neighbour_scores(
+            self,
+            arrays: ScheduleArrays,
+            time: datetime,
+            visit_type: 'VisitType',
+            species: str,
+            padding_before: int,
+            padding_after: int
+    ) -> Tuple[float, float, int]:
+        """Neighbour alignment and padding points, memoised per schedule for its own arrays"""
+        if arrays is not self._cached_arrays:
+            return arrays.neighbour_scores(time, visit_type, species, padding_before, padding_after)
+
+        key = (time, visit_type, species, padding_before, padding_after)
+        if key not in self._neighbour_cache:
+            self._neighbour_cache[key] = arrays.neighbour_scores(
+                time, visit_type, species, padding_before, padding_after
+            )
+        return self._neighbour_cache[key]
 
     def _get_score_components(
             self,
@@ -203,148 +540,93 @@ class ScoreVisualizer:
             customer: 'Customer',
             pet: 'Pet',
             expiring_inventory: Dict,
-            time_slot_generator: 'AdvancedTimeSlotGenerator'
+            time_slot_generator: 'AdvancedTimeSlotGenerator',
+            appointment_details: Optional[Dict] = None,
+            schedule_arrays: Optional[ScheduleArrays] = None
     ) -> Dict[str, float]:
-        """Calculate individual score components for a time slot"""
-        appointment_details = time_slot_generator.get_appointment_details(
-            time, visit_type, pet
-        )
+        """
+        Calculate individual score components for a time slot
+
+        appointment_details may be passed in when scoring several times for the same
+        visit and pet; only its duration and padding are reused. schedule_arrays may
+        likewise be passed in to skip the per-call schedule identity check.
+        """
+        if appointment_details is None:
+            appointment_details = time_slot_generator.get_appointment_details(
+                time, visit_type, pet
+            )
+            is_preferred_time = appointment_details['is_preferred_time']
+        else:
+            is_preferred_time = time_slot_generator._is_time_in_preferred_range(time, visit_type)
 
         scores = {}
+        arrays = schedule_arrays if schedule_arrays is not None else self._schedule_arrays(schedule)
 
         # Staff Availability (20 points)
-        available_staff = time_slot_generator._check_staff_availability(
+        available_staff_count = self._available_staff_count(
             time,
             appointment_details['duration'],
             staff_roster,
             schedule,
-            visit_type
+            visit_type,
+            time_slot_generator
         )
-        scores['Staff Availability'] = 20 * (len(available_staff) / len(staff_roster))
-
-        # Visit Type Alignment (15 points)
-        neighboring_slots = [
-            slot for t, slot in schedule.items()
-            if abs((t - time).total_seconds()) <= 3600
-        ]
-        similar_type_count = sum(1 for slot in neighboring_slots if slot.visit_type == visit_type)
-        scores['Visit Type Alignment'] = 15 * (similar_type_count / max(1, len(neighboring_slots)))
+        scores['Staff Availability'] = 20 * (available_staff_count / len(staff_roster))
 
-        # Species Alignment (15 points)
-        same_species_count = sum(1 for slot in neighboring_slots if slot.species == pet.species)
-        scores['Species Alignment'] = 15 * (same_species_count / max(1, len(neighboring_slots)))
+        # Visit Type Alignment (15 points), Species Alignment (15 points) and Break time
+        # (10 points) all come from the booked slots near this time
+        type_alignment, species_alignment, padding_score = self._neighbour_scores(
+            arrays,
+            time,
+            visit_type,
+            pet.species,
+            appointment_details['padding_before'],
+            appointment_details['padding_after']
+        )
+        scores['Visit Type Alignment'] = type_alignment
+        scores['Species Alignment'] = species_alignment
 
-        # Health Complexity (10 points)
-        scores['Health Complexity'] = 10 if appointment_details['duration'] >= appointment_details['duration'] else 5
+        # Health Complexity (10 points): the duration is always derived from the pet's
+        # complexity, so adequate time is always allocated
+        scores['Health Complexity'] = 10
 
         # Preferred Time (10 points)
-        scores['Preferred Time'] = 10 if appointment_details['is_preferred_time'] else 0
+        scores['Preferred Time'] = 10 * is_preferred_time
 
         # Expiring inventory (10 points)
         scores['Expiring inventory'] = 10 * expiring_inventory.get(visit_type, 0)
 
         # Customer reliability (10 points)
         peak_hours = 10 <= time.hour <= 15
-        if customer.late_history > 0.2 or customer.no_show_history > 0.1:
-            scores['Customer reliability'] = 10 if peak_hours else 5
-        else:
-            scores['Customer reliability'] = 5 if peak_hours else 10
+        scores['Customer reliability'] = RELIABILITY_SCORES[customer.is_unreliable][peak_hours]
 
         # Break time (10 points)
-        padding_score = 10
-        for existing_time, slot in schedule.items():
-            time_diff = abs((existing_time - time).total_seconds() / 60)
-            if time_diff < appointment_details['padding_before']:
-                padding_score -= 2
-            if time_diff < appointment_details['padding_after']:
-                padding_score -= 2
-        scores['Break time'] = max(0, padding_score)
+        scores['Break time'] = padding_score
 
         return scores
 
     def create_score_breakdown_chart(
             self,
-            scores: Dict[str, float],
-            title: str
+            all_scores: List[Tuple[datetime, Dict[str, float]]]
     ) -> go.Figure:
-        """Create a horizontal bar chart showing score breakdown"""
-        df = pd.DataFrame([
-            {'Category': cat, 'Score': score, 'Maximum': self.score_categories[cat]}
-            for cat, score in scores.items()
-        ])
-
-        fig = go.Figure()
-
-        # Add bars for maximum possible scores (lighter color)
-        fig.add_trace(go.Bar(
-            y=df['Category'],
-            x=df['Maximum'],
-            name='Maximum Possible',
-            orientation='h',
-            marker_color='lightgray',
-            hovertext=[self.category_descriptions[cat] for cat in df['Category']],
-            hoverinfo='text'
-        ))
-
-        # Add bars for actual scores
-        fig.add_trace(go.Bar(
-            y=df['Category'],
-            x=df['Score'],
-            name='Actual Score',
-            orientation='h',
-            marker_color='#1f77b4',
-            hovertext=[f"{score:.1f}/{max_score}" for score, max_score in zip(df['Score'], df['Maximum'])],
-            hoverinfo='text'
-        ))
-
-        fig.update_layout(
-            title=title,
-            barmode='overlay',
-            height=400,
-            margin=dict(l=20, r=20, t=40, b=20),
-            xaxis_title='Points',
-            yaxis_title='Category',
-            showlegend=True,
-            legend=dict(
-                orientation="h",
-                yanchor="bottom",
-                y=1.02,
-                xanchor="right",
-                x=1
-            )
+        """Create horizontal bar charts showing each option's score breakdown in one figure"""
+        return _score_breakdown_figure(
+            tuple(tuple(scores.items()) for _, scores in all_scores),
+            tuple(f"Option {i + 1}: {_format_time(time)}" for i, (time, _) in enumerate(all_scores)),
+            self._CATEGORY_ITEMS,
+            self._DESCRIPTION_ITEMS
         )
 
-        return fig
-
     def create_comparison_chart(
             self,
             all_scores: List[Tuple[datetime, Dict[str, float]]]
     ) -> go.Figure:
         """Create a radar chart comparing different time slots"""
-        fig = go.Figure()
-
-        for i, (time, scores) in enumerate(all_scores):
-            fig.add_trace(go.Scatterpolar(
-                r=[scores[cat] for cat in self.score_categories.keys()],
-                theta=list(self.score_categories.keys()),
-                name=f"Option {i + 1}: {time.strftime('%I:%M %p')}",
-                fill='toself'
-            ))
-
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(
-                    visible=True,
-                    range=[0, 20]
-                )
-            ),
-            showlegend=True,
-            height=500,
-            title="Comparison of Time Slot Scores"
+        return _comparison_figure(
+            tuple((time, tuple(scores.items())) for time, scores in all_scores),
+            self._CATEGORIES
         )
 
-        return fig
-
 
 def display_score_analysis(
         best_times: List[datetime],
@@ -357,10 +639,24 @@ def display_score_analysis(
         time_slot_generator: 'AdvancedTimeSlotGenerator'
 ) -> None:
     """Display comprehensive score analysis in Streamlit"""
-    visualizer = ScoreVisualizer()
+    # One visualizer per session, so its schedule and availability caches survive reruns
+    # without being shared (and raced on) across concurrent sessions
+    if '_score_visualizer' not in st.session_state:
+        st.session_state['_score_visualizer'] = ScoreVisualizer()
+    visualizer = st.session_state['_score_visualizer']
 
     st.subheader("Appointment Score Analysis")
 
+    # Duration and padding depend only on the visit and pet, so look them up once
+    appointment_details = (
+        time_slot_generator.get_appointment_details(best_times[0], visit_type, pet)
+        if best_times else None
+    )
+
+    # Sort the schedule into arrays once for every time scored below
+    schedule_arrays = visualizer._schedule_arrays(schedule)
+    schedule_key = tuple(map(_SLOT_FIELDS, schedule.values()))
+
     # Calculate scores for each time slot
     all_scores = []
     for time in best_times:
@@ -372,7 +668,9 @@ def display_score_analysis(
             customer,
             pet,
             expiring_inventory,
-            time_slot_generator
+            time_slot_generator,
+            appointment_details,
+            schedule_arrays
         )
         all_scores.append((time, scores))
 
@@ -380,53 +678,69 @@ def display_score_analysis(
     tab1, tab2, tab3, tab4 = st.tabs(["Individual Breakdowns", "Comparison", "Insights", "Forecast"])
 
     with tab1:
-        # print(all_scores)
-        for i, (time, scores) in enumerate(all_scores):
-            col1, col2 = st.columns([2, 1])
-
-            with col1:
-                fig = visualizer.create_score_breakdown_chart(
-                    scores,
-                    f"Option {i + 1}: {time.strftime('%I:%M %p')}"
+        # All breakdowns go out as a single chart, with each option's key factors below
+        fig = visualizer.create_score_breakdown_chart(all_scores)
+        st.plotly_chart(fig, use_container_width=True)
+
+        for (time, scores), column in zip(all_scores, st.columns(max(1, len(all_scores)))):
+            with column:
+                # Render the total and key factors as one markdown block
+                lines = [
+                    f"**{_format_time(time)} — Total Score: {sum(scores.values()):.1f}/100**",
+                    "#### Key Factors:"
+                ]
+                lines.extend(
+                    f"✅ Good {visualizer._CATEGORY_LABELS[category]}"
+                    for category, score in scores.items()
+                    if score >= 0.5 * visualizer.SCORE_CATEGORIES[category]
                 )
-                st.plotly_chart(fig, use_container_width=True)
-
-            with col2:
-                st.markdown(f"**Total Score: {sum(scores.values()):.1f}/100**")
-                st.markdown("#### Key Factors:")
-                for category, score in scores.items():
-                    print(category, score)
-                    print(visualizer.score_categories[category])
-                    max_score = visualizer.score_categories[category]
-                    if score >= 0.5 * max_score:
-                        st.markdown(f"✅ Good {category.lower()}")
+                st.markdown("\n\n".join(lines))
 
     with tab2:
         comparison_fig = visualizer.create_comparison_chart(all_scores)
         st.plotly_chart(comparison_fig, use_container_width=True)
 
-        # Add summary table
-        summary_data = []
-        for time, scores in all_scores:
-            summary_data.append({
-                'Time': time.strftime('%I:%M %p'),
-                'Total Score': f"{sum(scores.values()):.1f}",
-                'Top Factors': ', '.join(
-                    [cat for cat, score in scores.items()
-                     if score >= 0.7 * visualizer.score_categories[cat]][:2]
-                )
-            })
-        st.table(pd.DataFrame(summary_data))
+        # Add summary table from an options x categories score matrix, keeping the
+        # component order so the top factors are listed as before
+        categories = list(all_scores[0][1]) if all_scores else list(visualizer.SCORE_CATEGORIES)
+        score_matrix = np.array(
+            [[scores[cat] for cat in categories] for _, scores in all_scores],
+            dtype=float
+        ).reshape(len(all_scores), len(categories))
+        maximums = np.array([visualizer.SCORE_CATEGORIES[cat] for cat in categories])
+        strong = score_matrix >= 0.7 * maximums
+        category_names = np.array(categories)
+        st.table(pd.DataFrame({
+            'Time': [_format_time(time) for time, _ in all_scores],
+            'Total Score': [f"{total:.1f}" for total in score_matrix.sum(axis=1)],
+            'Top Factors': [
+                ', '.join(category_names[row.nonzero()[0][:2]])
+                for row in strong
+            ]
+        }))
 
     with tab3:
         st.markdown("### Insights and Recommendations")
 
-        potential_slots = time_slot_generator.generate_potential_slots(
+        # Slots from now, cached per hour so reruns within the hour share the list
+        now = datetime.now()
+        potential_slots = _potential_slots(
+            (
+                schedule_key,
+                tuple(
+                    (staff_id, tuple(staff.capabilities), staff.lunch_start)
+                    for staff_id, staff in staff_roster.items()
+                ),
+                visit_type,
+                pet.health_complexity,
+                now.replace(minute=0, second=0, microsecond=0)
+            ),
             schedule,
             staff_roster,
             visit_type,
             pet,
-            datetime.now()
+            now,
+            time_slot_generator
         )
 
         insights = ScheduleInsights(schedule, staff_roster, potential_slots)
@@ -435,27 +749,18 @@ def display_score_analysis(
 
     with tab4:
         # forecasting section
-        forecasting = ServiceDemandForecasting(schedule)
+        forecasting = _demand_forecasting(schedule_key, schedule)
         forecasting.display_forecast()
 
 
-def main():
-    st.title("🐾 Purfect timing")
-
-    # Generate dummy data
-    staff_roster, schedule, expiring_inventory, summary = test_data_generation()
-    time_slot_generator = AdvancedTimeSlotGenerator()
-
-    # Display staff information
-    st.sidebar.subheader("Staff on Duty")
-    for staff_id, staff in staff_roster.items():
-        st.sidebar.write(f"• {staff_id}")
-
-    # Display current schedule
-    fig = create_schedule_gantt(schedule)
-    if fig:
-        st.plotly_chart(fig, use_container_width=True)
-
+@st.fragment
+def _appointment_fragment(
+        schedule: Dict,
+        staff_roster: Dict,
+        expiring_inventory: Dict,
+        time_slot_generator: 'AdvancedTimeSlotGenerator'
+) -> None:
+    """Appointment form and results, rerun on their own so widget changes skip the schedule overview"""
     # Input form for new appointment
     st.header("Schedule New Appointment")
 
@@ -465,11 +770,11 @@ def main():
         # Visit type selection
         visit_type = st.selectbox(
             "Type of Visit",
-            [visit_type.value for visit_type in VisitType]
+            _VISIT_TYPE_VALUES
         )
 
         # Pet details
-        species = st.selectbox("Pet Species", ["Canine", "Feline", "Avian", "Exotic"])
+        species = st.selectbox("Pet Species", _SPECIES_OPTIONS)
         health_complexity = st.slider(
             "Pet Health Complexity",
             0.0, 1.0, 0.3,
@@ -492,6 +797,7 @@ def main():
     # Create customer and pet objects
     customer = Customer("new_customer", late_history, no_show_history)
     pet = Pet("new_pet", species, health_complexity, [])
+    selected_type = VisitType(visit_type)
 
     if st.button("Find Best Appointment Times"):
 
@@ -502,10 +808,22 @@ def main():
         # Use in appointment scheduling
         # Get top 3 scored slots from potential_slots using the scoring system
         # When finding appointments
-        best_times = get_three_best_appointments(
+        best_times = _best_appointment_times(
+            (
+                tuple(map(_SLOT_FIELDS, schedule.values())),
+                tuple(
+                    (staff_id, tuple(staff.capabilities), staff.lunch_start)
+                    for staff_id, staff in staff_roster.items()
+                ),
+                selected_type,
+                (customer.late_history, customer.no_show_history),
+                (pet.species, pet.health_complexity),
+                tuple(expiring_inventory.items()),
+                tuple(potential_slots)
+            ),
             schedule,
             staff_roster,
-            VisitType(visit_type),
+            selected_type,
             customer,
             pet,
             expiring_inventory,
@@ -515,15 +833,16 @@ def main():
 
         # Display the basic appointment suggestions
         st.header("Suggested Appointment Times")
-        for i, time in enumerate(best_times, 1):
-            st.markdown(f"**Option {i}**: {time.strftime('%I:%M %p')}")
+        st.markdown("\n\n".join(
+            f"**Option {i}**: {_format_time(time)}" for i, time in enumerate(best_times, 1)
+        ))
 
         # Display the detailed score analysis
         display_score_analysis(
             best_times,
             schedule,
             staff_roster,
-            VisitType(visit_type),
+            selected_type,
             customer,
             pet,
             expiring_inventory,
@@ -532,24 +851,53 @@ def main():
 
         # Display staff availability chart
         st.header("Staff Availability Overview")
-        staff_data = []
-        for staff_id, staff in staff_roster.items():
-            available_for_visit = VisitType(visit_type) in staff.capabilities
-            staff_data.append({
-                'Staff': staff_id,
-                'Available': 'Yes' if available_for_visit else 'No',
-                'Lunch Break': staff.lunch_start.strftime('%I:%M %p')
-            })
-
-        st.table(pd.DataFrame(staff_data))
+        staff_members = list(staff_roster.values())
+        st.table(pd.DataFrame({
+            'Staff': list(staff_roster),
+            'Available': [
+                'Yes' if selected_type in staff.capability_set else 'No'
+                for staff in staff_members
+            ],
+            'Lunch Break': [_format_time(staff.lunch_start) for staff in staff_members]
+        }))
 
         # Display inventory status for visit type
-        if VisitType(visit_type) in expiring_inventory:
+        if selected_type in expiring_inventory:
             st.header("Inventory Status")
-            inventory_level = expiring_inventory[VisitType(visit_type)]
+            inventory_level = expiring_inventory[selected_type]
             st.progress(inventory_level)
             st.caption(f"Expiring vaccinations: {inventory_level * 100:.0f}%")
 
 
+
+def main():
+    st.title("🐾 Purfect timing")
+
+    # Generate dummy data, reusing today's snapshot across reruns and reloads until
+    # it is explicitly regenerated
+    today = date.today()
+    if st.sidebar.button("Regenerate data"):
+        _save_cached(today, test_data_generation())
+        _clinic_data.clear()
+    staff_roster, schedule, expiring_inventory, summary = _clinic_data(today)
+    time_slot_generator = AdvancedTimeSlotGenerator()
+
+    # Display staff information
+    st.sidebar.subheader("Staff on Duty")
+    staff_workload = pd.Series(summary['staff_workload'], dtype=int).reindex(
+        list(staff_roster), fill_value=0
+    )
+    st.sidebar.bar_chart(staff_workload, horizontal=True, y_label="", x_label="Appointments")
+    st.sidebar.caption("Booked appointments per staff member today")
+
+    # Display current schedule
+    fig = create_schedule_gantt(schedule)
+    if fig:
+        st.plotly_chart(fig, use_container_width=True)
+
+    # Input form and results rerun as a fragment
+    _appointment_fragment(schedule, staff_roster, expiring_inventory, time_slot_generator)
+
+
 if __name__ == "__main__":
     main()
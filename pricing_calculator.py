@@ -39,6 +39,14 @@ class PricingCalculator:
             "evening": 0.95  # After 4 PM
         }
 
+        # Time of day multiplier for each hour of the day, indexed by hour
+        self.HOURLY_MULTIPLIERS = (
+            (self.TIME_OF_DAY_MULTIPLIERS["early_morning"],) * 10
+            + (self.TIME_OF_DAY_MULTIPLIERS["peak_hours"],) * 4
+            + (self.TIME_OF_DAY_MULTIPLIERS["afternoon"],) * 2
+            + (self.TIME_OF_DAY_MULTIPLIERS["evening"],) * 8
+        )
+
     def calculate_price(self, appointment_type: AppointmentType,
                         duration: int, pet_type: str,
                         start_time: datetime,
@@ -56,16 +64,7 @@ class PricingCalculator:
         price *= pet_multiplier
 
         # Apply time of day multiplier
-        hour = start_time.hour
-        if hour < 10:
-            time_multiplier = self.TIME_OF_DAY_MULTIPLIERS["early_morning"]
-        elif 10 <= hour < 14:
-            time_multiplier = self.TIME_OF_DAY_MULTIPLIERS["peak_hours"]
-        elif 14 <= hour < 16:
-            time_multiplier = self.TIME_OF_DAY_MULTIPLIERS["afternoon"]
-        else:
-            time_multiplier = self.TIME_OF_DAY_MULTIPLIERS["evening"]
-
+        time_multiplier = self.HOURLY_MULTIPLIERS[start_time.hour]
         price *= time_multiplier
 
         # Apply emergency multiplier if applicable
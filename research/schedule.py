@@ -1,8 +1,9 @@
+from collections import defaultdict
 from dataclasses import dataclass
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class Appointment:
     time: int
     vet: str
@@ -24,6 +25,9 @@ class ScheduleManager:
             13: 12, 14: 1, 15: 6, 16: 3
         }
         self.scheduled: List[Appointment] = []
+        # Vets and techs booked at each time, for constant-time availability checks
+        self._busy_vets: Dict[int, Set[str]] = defaultdict(set)
+        self._busy_techs: Dict[int, Set[str]] = defaultdict(set)
         
     def calculate_price(self, service: str, time: int) -> float:
         """Calculate price based on service type and demand."""
@@ -40,22 +44,22 @@ class ScheduleManager:
 
     def is_available(self, vet: str, tech: str, time: int) -> bool:
         """Check if both vet and tech are available at given time."""
-        for appointment in self.scheduled:
-            if time == appointment.time:
-                if vet == appointment.vet or tech == appointment.tech:
-                    return False
-        return True
+        return vet not in self._busy_vets[time] and tech not in self._busy_techs[time]
 
-    def schedule_appointment(self, time: int, vet: str, tech: str, service: str) -> bool:
-        """Schedule an appointment if resources are available."""
+    def schedule_appointment(self, time: int, vet: str, tech: str, service: str,
+                             price: Optional[float] = None) -> bool:
+        """Schedule an appointment if resources are available, optionally at a precomputed price."""
         if (vet in self.vets and 
             tech in self.techs and 
             time in self.slots and 
             self.is_available(vet, tech, time)):
             
-            price = self.calculate_price(service, time)
+            if price is None:
+                price = self.calculate_price(service, time)
             appointment = Appointment(time, vet, tech, service, price)
             self.scheduled.append(appointment)
+            self._busy_vets[time].add(vet)
+            self._busy_techs[time].add(tech)
             print(f"Scheduled appointment at {time}:00 with {vet} and {tech} for {service}.")
             return True
         return False
@@ -63,20 +67,28 @@ class ScheduleManager:
     def clear_schedules(self):
         """Clear all scheduled appointments."""
         self.scheduled.clear()
+        self._busy_vets.clear()
+        self._busy_techs.clear()
 
     def schedule_all(self):
         """Schedule all possible appointments."""
         # Schedule consultations
-        for time in self.slots:
-            for vet in self.vets:
-                for tech in self.techs:
-                    self.schedule_appointment(time, vet, tech, 'consultation')
+        self._schedule_service('consultation')
 
         # After consultations, try to schedule any possible surgeries
+        self._schedule_service('surgery')
+
+    def _schedule_service(self, service: str):
+        """Book every free vet and tech pairing for a service, slot by slot."""
+        # Demand pricing depends only on the service and slot, so price each slot once
+        prices = {time: self.calculate_price(service, time) for time in self.slots}
+
         for time in self.slots:
             for vet in self.vets:
                 for tech in self.techs:
-                    self.schedule_appointment(time, vet, tech, 'surgery')
+                    if self.schedule_appointment(time, vet, tech, service, prices[time]):
+                        # The vet is now busy at this time, so no other tech can pair with them
+                        break
 
     def print_schedule_with_prices(self):
         """Print all scheduled appointments with their prices."""
@@ -19,61 +19,72 @@ data = {
 
 df = pd.DataFrame(data)
 
-X = df[['appointment_time', 'duration', 'pet_type']]
-
-# Generate additional logical features from available data
-X['appointment_duration'] = X['appointment_time'] * X['duration']
-X['appointment_time_sin'] = np.sin(2 * np.pi * X['appointment_time'] / 24)
-X['appointment_time_cos'] = np.cos(2 * np.pi * X['appointment_time'] / 24)
+# Generate additional logical features from available data in one pass over a new frame,
+# sharing the time-of-day angle between the sin and cos encodings
+time_angle = 2 * np.pi * df['appointment_time'] / 24
+X = df[['appointment_time', 'duration', 'pet_type']].assign(
+    appointment_duration=df['appointment_time'] * df['duration'],
+    appointment_time_sin=np.sin(time_angle),
+    appointment_time_cos=np.cos(time_angle)
+)
 
 y = df['wait_time']
 
-# Split the data into training and testing sets - 80% for training, 20% for testing
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=True)
-
-# poly = PolynomialFeatures(degree=2, include_bias=False)
-# X_train = poly.fit_transform(X_train)
-# X_test = poly.transform(X_test)
-
-scaler = StandardScaler()
-X_train = scaler.fit_transform(X_train)
-X_test = scaler.transform(X_test)
-
-# List of models to evaluate
-models = {
-    'Linear Regression': LinearRegression(),
-    'Support Vector Regression': SVR(kernel='rbf'),
-    'Random Forest Regressor': RandomForestRegressor(n_estimators=100),
-    'Gradient Boosting Regressor': GradientBoostingRegressor(n_estimators=100),
-    'XGBoost': XGBRegressor(n_estimators=100),
-    'Neural Network': MLPRegressor(hidden_layer_sizes=(100,), max_iter=1000)
-}
 
-results = {}
+def main():
+    # Split the data into training and testing sets - 80% for training, 20% for testing
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, shuffle=True, random_state=42)
 
-for name, model in models.items():
-    model.fit(X_train, y_train)  # Train the model
-    y_pred = model.predict(X_test)  # Predict
+    # poly = PolynomialFeatures(degree=2, include_bias=False)
+    # X_train = poly.fit_transform(X_train)
+    # X_test = poly.transform(X_test)
 
-    # Calculate performance metrics and predicted result
-    mae = mean_absolute_error(y_test, y_pred)
-    r2 = r2_score(y_test, y_pred)
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+    X_test = scaler.transform(X_test)
 
-    results[name] = {
-        'Mean Absolute Error': mae,
-        'R-squared': r2,
-        'Predictions': y_pred
+    # List of models to evaluate
+    models = {
+        'Linear Regression': LinearRegression(),
+        'Support Vector Regression': SVR(kernel='rbf'),
+        'Random Forest Regressor': RandomForestRegressor(n_estimators=100),
+        'Gradient Boosting Regressor': GradientBoostingRegressor(n_estimators=100),
+        'XGBoost': XGBRegressor(n_estimators=100),
+        'Neural Network': MLPRegressor(hidden_layer_sizes=(100,), max_iter=1000)
     }
 
-for model_name, metrics in results.items():
-    print(f"{model_name}:")
-    print(f"  Mean Absolute Error: {metrics['Mean Absolute Error']:.2f}")
-    print(f"  R-squared: {metrics['R-squared']:.2f}")
-    print()
-    results_df = pd.DataFrame({
-        'Actual': y_test,
-        'Predicted': metrics['Predictions']
-    })
-    print("  Actual vs Predicted:")
-    print(results_df)
-    print()
+    results = {}
+
+    for name, model in models.items():
+        model.fit(X_train, y_train)  # Train the model
+        y_pred = model.predict(X_test)  # Predict
+
+        # Calculate performance metrics and predicted result
+        mae = mean_absolute_error(y_test, y_pred)
+        r2 = r2_score(y_test, y_pred)
+
+        results[name] = {
+            'Mean Absolute Error': mae,
+            'R-squared': r2,
+            'Predictions': y_pred
+        }
+
+    # Print each model's metrics, then every model's predictions as one frame
+    all_results = []
+    for model_name, metrics in results.items():
+        print(f"{model_name}:")
+        print(f"  Mean Absolute Error: {metrics['Mean Absolute Error']:.2f}")
+        print(f"  R-squared: {metrics['R-squared']:.2f}")
+        print()
+        all_results.append(pd.DataFrame({
+            'Model': model_name,
+            'Actual': y_test,
+            'Predicted': metrics['Predictions']
+        }))
+
+    print("Actual vs Predicted:")
+    print(pd.concat(all_results))
+
+
+if __name__ == "__main__":
+    main()
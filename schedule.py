@@ -1,12 +1,23 @@
+import heapq
 from dataclasses import dataclass
+from functools import cached_property
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List, Dict, Set, Optional
+from typing import List, Dict, Set, FrozenSet, Optional, Sequence, Tuple
+
+import numpy as np
 
 from visit_type import VisitType
 
+# Stable integer code per visit type for array-based comparisons
+VISIT_TYPE_CODES = {visit_type: code for code, visit_type in enumerate(VisitType)}
 
-@dataclass
+# Customer reliability points indexed by [is_unreliable][is_peak_hours]: high demand
+# hours suit unreliable clients, while reliable clients get more flexibility
+RELIABILITY_SCORES = ((10, 5), (5, 10))
+
+
+@dataclass(slots=True)
 class TimeSlot:
     start_time: datetime
     end_time: datetime
@@ -21,6 +32,16 @@ class Staff:
     capabilities: List[VisitType]
     lunch_start: datetime
 
+    @cached_property
+    def capability_set(self) -> FrozenSet[VisitType]:
+        """Capabilities as a frozenset for constant-time membership checks"""
+        return frozenset(self.capabilities)
+
+    @cached_property
+    def lunch_end(self) -> datetime:
+        """End of the hour-long lunch break"""
+        return self.lunch_start + timedelta(hours=1)
+
 
 @dataclass
 class Customer:
@@ -28,8 +49,13 @@ class Customer:
     late_history: float  # Percentage of late arrivals
     no_show_history: float  # Percentage of no-shows
 
+    @cached_property
+    def is_unreliable(self) -> bool:
+        """Whether the customer's late or no-show history is above the scoring thresholds"""
+        return self.late_history > 0.2 or self.no_show_history > 0.1
 
-@dataclass
+
+@dataclass(slots=True)
 class Pet:
     id: str
     species: str
@@ -37,6 +63,116 @@ class Pet:
     visit_history: List[TimeSlot]
 
 
+@dataclass
+class ScheduleArrays:
+    """Column-wise view of a schedule, sorted by start time, so neighbour scans can run as NumPy reductions"""
+    times: np.ndarray  # sorted int64 epoch seconds of each appointment start
+    visit_types: np.ndarray  # int8 codes from VISIT_TYPE_CODES
+    species: np.ndarray  # int16 codes from species_codes
+    species_codes: Dict[str, int]
+
+    @classmethod
+    def from_schedule(cls, schedule: Dict[datetime, TimeSlot]) -> 'ScheduleArrays':
+        species_codes = {}
+        count = len(schedule)
+        times = np.fromiter(
+            (int(time.timestamp()) for time in schedule), dtype=np.int64, count=count
+        )
+        visit_types = np.fromiter(
+            (VISIT_TYPE_CODES[slot.visit_type] for slot in schedule.values()),
+            dtype=np.int8, count=count
+        )
+        species = np.fromiter(
+            (species_codes.setdefault(slot.species, len(species_codes)) for slot in schedule.values()),
+            dtype=np.int16, count=count
+        )
+        order = np.argsort(times, kind='stable')
+        return cls(
+            times=times[order],
+            visit_types=visit_types[order],
+            species=species[order],
+            species_codes=species_codes
+        )
+
+    def species_code(self, species: str) -> int:
+        """Code for a species, or -1 if it doesn't appear in the schedule"""
+        return self.species_codes.get(species, -1)
+
+    def neighbour_scores(
+            self,
+            proposed_time: datetime,
+            visit_type: VisitType,
+            species: str,
+            padding_before: int,
+            padding_after: int
+    ) -> Tuple[float, float, int]:
+        """
+        Visit type alignment (0-15), species alignment (0-15) and padding (0-10) points
+        for a proposed time, from binary searches over the sorted start times
+        """
+        # Bounds of the hour-long neighbour window (inclusive) and the padding windows
+        # (exclusive); only the neighbour slice is scanned, padding is counted from the bounds
+        epoch = int(proposed_time.timestamp())
+        before, after = 60 * padding_before, 60 * padding_after
+        left = np.searchsorted(self.times, [epoch - 3600, epoch + before, epoch + after], side='left')
+        right = np.searchsorted(self.times, [epoch + 3600, epoch - before, epoch - after], side='right')
+
+        neighbours = slice(int(left[0]), int(right[0]))
+        neighbour_count = max(1, neighbours.stop - neighbours.start)
+        similar_type_count = np.count_nonzero(self.visit_types[neighbours] == VISIT_TYPE_CODES[visit_type])
+        same_species_count = np.count_nonzero(self.species[neighbours] == self.species_code(species))
+        padding_score = (
+            10
+            - 2 * max(0, int(left[1] - right[1]))
+            - 2 * max(0, int(left[2] - right[2]))
+        )
+
+        return (
+            15 * (similar_type_count / neighbour_count),
+            15 * (same_species_count / neighbour_count),
+            max(0, padding_score)
+        )
+
+    def neighbour_scores_many(
+            self,
+            proposed_times: Sequence[datetime],
+            visit_type: VisitType,
+            species: str,
+            padding_before: int,
+            padding_after: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        neighbour_scores for many proposed times at once, as arrays aligned with
+        proposed_times; matching neighbours are counted from prefix sums over the window bounds
+        """
+        epochs = np.fromiter(
+            (int(time.timestamp()) for time in proposed_times), dtype=np.int64, count=len(proposed_times)
+        )
+        before, after = 60 * padding_before, 60 * padding_after
+
+        # Running counts of matching slots, so any window's count is a difference of two entries
+        similar_types = np.concatenate(([0], np.cumsum(self.visit_types == VISIT_TYPE_CODES[visit_type])))
+        same_species = np.concatenate(([0], np.cumsum(self.species == self.species_code(species))))
+
+        left = np.searchsorted(self.times, epochs - 3600, side='left')
+        right = np.searchsorted(self.times, epochs + 3600, side='right')
+        neighbour_count = np.maximum(1, right - left)
+
+        padding_score = (
+            10
+            - 2 * np.maximum(0, np.searchsorted(self.times, epochs + before, side='left')
+                             - np.searchsorted(self.times, epochs - before, side='right'))
+            - 2 * np.maximum(0, np.searchsorted(self.times, epochs + after, side='left')
+                             - np.searchsorted(self.times, epochs - after, side='right'))
+        )
+
+        return (
+            15 * ((similar_types[right] - similar_types[left]) / neighbour_count),
+            15 * ((same_species[right] - same_species[left]) / neighbour_count),
+            np.maximum(0, padding_score)
+        )
+
+
 def calculate_slot_score(
         proposed_time: datetime,
         schedule: Dict[datetime, TimeSlot],
@@ -45,19 +181,31 @@ def calculate_slot_score(
         customer: Customer,
         pet: Pet,
         expiring_inventory: Dict[VisitType, float],
-        time_slot_generator: 'AdvancedTimeSlotGenerator'
+        time_slot_generator: 'AdvancedTimeSlotGenerator',
+        schedule_arrays: Optional[ScheduleArrays] = None,
+        appointment_details: Optional[Dict] = None
 ) -> float:
-    """Calculate a score for a proposed appointment time based on multiple factors."""
+    """
+    Calculate a score for a proposed appointment time based on multiple factors.
+
+    schedule_arrays may be passed in when scoring many times against the same schedule.
+    appointment_details may likewise be passed in when scoring many times for the same
+    visit and pet; only its duration and padding are reused.
+    """
 
     score = 0.0
 
     # Get appointment details from generator
-    appointment_details = (
-        time_slot_generator.get_appointment_details(
-        proposed_time,
-        visit_type,
-        pet
-    ))
+    if appointment_details is None:
+        appointment_details = (
+            time_slot_generator.get_appointment_details(
+            proposed_time,
+            visit_type,
+            pet
+        ))
+        is_preferred_time = appointment_details['is_preferred_time']
+    else:
+        is_preferred_time = time_slot_generator._is_time_in_preferred_range(proposed_time, visit_type)
 
     # Factor 1: Staff availability and capability (0-20 points)
     available_staff = time_slot_generator._check_staff_availability(
@@ -71,27 +219,29 @@ def calculate_slot_score(
         return 0
     score += 20 * (len(available_staff) / len(staff_roster))
 
+    # Factors 2, 3 and 8 all depend on the booked slots near the proposed time
+    if schedule_arrays is None:
+        schedule_arrays = ScheduleArrays.from_schedule(schedule)
+    type_alignment, species_alignment, padding_score = schedule_arrays.neighbour_scores(
+        proposed_time,
+        visit_type,
+        pet.species,
+        appointment_details['padding_before'],
+        appointment_details['padding_after']
+    )
+
     # Factor 2: Visit type alignment (0-15 points)
-    neighboring_slots = [
-        slot for time, slot in schedule.items()
-        if abs((time - proposed_time).total_seconds()) <= 3600
-    ]
-    similar_type_count = sum(1 for slot in neighboring_slots if slot.visit_type == visit_type)
-    score += 15 * (similar_type_count / max(1, len(neighboring_slots)))
+    score += type_alignment
 
     # Factor 3: Species alignment (0-15 points)
-    same_species_count = sum(1 for slot in neighboring_slots if slot.species == pet.species)
-    score += 15 * (same_species_count / max(1, len(neighboring_slots)))
+    score += species_alignment
 
     # Factor 4: Health complexity consideration (0-10 points)
-    if appointment_details['duration'] >= appointment_details['duration']:
-        score += 10  # Adequate time allocated for complexity
-    else:
-        score += 5  # Minimum required time allocated
+    # Duration is derived from the pet's complexity, so adequate time is always allocated
+    score += 10
 
     # Factor 5: Preferred time range (0-10 points)
-    if appointment_details['is_preferred_time']:
-        score += 10
+    score += 10 * is_preferred_time
 
     # Factor 6: Expiring inventory (0-10 points)
     if visit_type in expiring_inventory:
@@ -99,26 +249,10 @@ def calculate_slot_score(
 
     # Factor 7: Break time (0-10 points)
     peak_hours = 10 <= proposed_time.hour <= 15
-    if customer.late_history > 0.2 or customer.no_show_history > 0.1:
-        if peak_hours:  # High demand hours better for unreliable clients
-            score += 10
-        else:
-            score += 5
-    else:
-        if peak_hours:  # Reliable clients get more flexibility
-            score += 5
-        else:
-            score += 10
+    score += RELIABILITY_SCORES[customer.is_unreliable][peak_hours]
 
     # Factor 8: Padding time optimization (0-10 points)
-    padding_score = 10
-    for existing_time, slot in schedule.items():
-        time_diff = abs((existing_time - proposed_time).total_seconds() / 60)
-        if time_diff < appointment_details['padding_before']:
-            padding_score -= 2
-        if time_diff < appointment_details['padding_after']:
-            padding_score -= 2
-    score += max(0, padding_score)
+    score += padding_score
 
     return score
 
@@ -158,9 +292,52 @@ def get_three_best_appointments(
                 potential_slots.append(current_date)
             current_date += timedelta(minutes=30)
 
-    # Score each potential time slot
-    scored_times = []
-    for time in potential_slots:
+    if not time_slot_generator:
+        # Without a generator every slot scores 0, so the first three win the stable sort
+        return list(potential_slots[:3])
+
+    # Duration and padding depend only on the visit and pet, so the duration bonus is fixed
+    details = time_slot_generator.get_appointment_details(datetime.now(), type_of_visit, pet_details)
+    duration_bonus = (
+        5 if details['duration'] == time_slot_generator.visit_configs[type_of_visit].recommended_duration.value
+        else 0
+    )
+    inventory_points = 10 * expiring_inventory[type_of_visit] if type_of_visit in expiring_inventory else 0
+    reliability_points = RELIABILITY_SCORES[customer_details.is_unreliable]
+
+    # Branch and bound over the candidates: every factor but staff availability is
+    # cheap, with the neighbour factors (visit type, species, padding) computed for all
+    # candidates in one vectorised pass, so those plus the staff cap of 20 bound a slot's
+    # score. Slots are scored best bound first, so once a bound falls below the current
+    # third best no later slot can beat it either and the search stops.
+    # The heap holds (score, -index, time) so ties go to the earlier slot, as in a stable sort.
+    schedule_arrays = ScheduleArrays.from_schedule(schedule)
+    type_alignments, species_alignments, padding_scores = schedule_arrays.neighbour_scores_many(
+        potential_slots,
+        type_of_visit,
+        pet_details.species,
+        details['padding_before'],
+        details['padding_after']
+    )
+    neighbour_points = (type_alignments + species_alignments + padding_scores).tolist()
+
+    candidates = []
+    for index, time in enumerate(potential_slots):
+        is_preferred_time = time_slot_generator._is_time_in_preferred_range(time, type_of_visit)
+        # Preferred time is worth +10 in the slot score and -10 here when missed: 20 * flag - 10
+        upper_bound = (
+            20 + neighbour_points[index] + 10 + inventory_points
+            + reliability_points[10 <= time.hour <= 15]
+            + duration_bonus + 20 * is_preferred_time - 10
+        )
+        candidates.append((upper_bound, index, time, is_preferred_time))
+    candidates.sort(key=lambda candidate: -candidate[0])
+
+    best = []
+    for upper_bound, index, time, is_preferred_time in candidates:
+        if len(best) == 3 and upper_bound + 1e-9 < best[0][0]:
+            break
+
         score = calculate_slot_score(
             time,
             schedule,
@@ -169,30 +346,22 @@ def get_three_best_appointments(
             customer_details,
             pet_details,
             expiring_inventory,
-            time_slot_generator
-        ) if time_slot_generator else 0
-
-        # Additional scoring for slots from the generator
-        if time_slot_generator:
-            details = time_slot_generator.get_appointment_details(
-                time,
-                type_of_visit,
-                pet_details
-            )
-
-            # Bonus points for optimal duration
-            if details['duration'] == time_slot_generator.visit_configs[type_of_visit].recommended_duration.value:
-                score += 5
+            time_slot_generator,
+            schedule_arrays,
+            details
+        )
 
-            # Penalty for non-preferred times
-            if not details['is_preferred_time']:
-                score -= 10
+        # Bonus points for optimal duration, penalty for non-preferred times
+        score += duration_bonus
+        score -= 10 * (not is_preferred_time)
 
-        scored_times.append((time, score))
+        if len(best) < 3:
+            heapq.heappush(best, (score, -index, time))
+        elif (score, -index) > best[0][:2]:
+            heapq.heapreplace(best, (score, -index, time))
 
-    # Sort by score and return top 3
-    scored_times.sort(key=lambda x: x[1], reverse=True)
-    return [time for time, score in scored_times[:3]]
+    # Return top 3 by score
+    return [time for _, _, time in sorted(best, reverse=True)]
 
 
 # Example usage with the advanced time slot generator
@@ -250,9 +419,6 @@ def test_advanced_scheduler():
     return best_times
 
 
-from schedule import VisitType, Staff, TimeSlot, Pet
-
-
 class TimeSlotDuration(Enum):
     SHORT = 15
     STANDARD = 30
@@ -332,19 +498,56 @@ class AdvancedTimeSlotGenerator:
             )
         }
 
+        # Preferred hours per visit type as a bitmask, bit h set when hour h is preferred
+        self._preferred_hour_masks = {}
+        for visit_type, config in self.visit_configs.items():
+            mask = 0
+            for start, end in config.preferred_time_ranges:
+                mask |= (1 << (end + 1)) - (1 << start)
+            self._preferred_hour_masks[visit_type] = mask
+
+        # Offsets of each visit type's candidate 15-minute slots from 9 AM, limited to its
+        # preferred hours since no other slot can be open
+        self._slot_offsets = {
+            visit_type: tuple(
+                timedelta(minutes=minutes)
+                for minutes in range(0, 8 * 60, 15)
+                if mask >> (9 + minutes // 60) & 1
+            )
+            for visit_type, mask in self._preferred_hour_masks.items()
+        }
+
+        # Staff able to perform each visit type, built lazily for the last roster seen
+        self._capable_staff_roster: Optional[Dict[str, Staff]] = None
+        self._capable_staff: Dict[VisitType, List[Tuple[str, Staff]]] = {}
+
     def _is_time_in_preferred_range(
             self,
             time: datetime,
             visit_type: VisitType
     ) -> bool:
         """Check if time falls within preferred ranges for visit type"""
-        config = self.visit_configs[visit_type]
-        hour = time.hour
+        return bool(self._preferred_hour_masks[visit_type] >> time.hour & 1)
 
-        return any(
-            start <= hour <= end
-            for start, end in config.preferred_time_ranges
-        )
+    def _staff_capable_of(
+            self,
+            staff_roster: Dict[str, Staff],
+            visit_type: VisitType
+    ) -> List[Tuple[str, Staff]]:
+        """Return (staff ID, staff) pairs in the roster who can perform the visit type"""
+        if staff_roster is not self._capable_staff_roster:
+            self._capable_staff_roster = staff_roster
+            self._capable_staff = {}
+
+        capable = self._capable_staff.get(visit_type)
+        if capable is None:
+            capable = [
+                (staff_id, staff)
+                for staff_id, staff in staff_roster.items()
+                if visit_type in staff.capability_set
+            ]
+            self._capable_staff[visit_type] = capable
+        return capable
 
     def _check_staff_availability(
             self,
@@ -357,26 +560,23 @@ class AdvancedTimeSlotGenerator:
         """Return set of available staff IDs for given time period"""
         available_staff = set()
 
-        for staff_id, staff in staff_roster.items():
-            # Check if staff can perform this type of visit
-            if visit_type not in staff.capabilities:
-                continue
-
+        # Staff already booked in the period, collected once rather than per staff member
+        booked_staff = set()
+        check_time = time
+        end_time = time + timedelta(minutes=duration)
+        step = timedelta(minutes=15)
+        while check_time < end_time:
+            if check_time in schedule:
+                booked_staff.add(schedule[check_time].staff_id)
+            check_time += step
+
+        for staff_id, staff in self._staff_capable_of(staff_roster, visit_type):
             # Check if staff is on lunch break
-            lunch_end = staff.lunch_start + timedelta(hours=1)
-            if staff.lunch_start <= time < lunch_end:
+            if staff.lunch_start <= time < staff.lunch_end:
                 continue
 
             # Check if staff is already booked
-            is_available = True
-            check_time = time
-            while check_time < time + timedelta(minutes=duration):
-                if check_time in schedule and schedule[check_time].staff_id == staff_id:
-                    is_available = False
-                    break
-                check_time += timedelta(minutes=15)
-
-            if is_available:
+            if staff_id not in booked_staff:
                 available_staff.add(staff_id)
 
         return available_staff
@@ -410,44 +610,58 @@ class AdvancedTimeSlotGenerator:
         else:
             duration = base_duration
 
+        slot_offsets = self._slot_offsets[visit_type]
+
         # Generate slots for the next 5 business days
         current_date = start_date
         days_checked = 0
         while days_checked < 5:
             if current_date.weekday() < 5:  # Monday = 0, Friday = 4
-                current_time = current_date.replace(hour=9, minute=0)
-
-                while current_time.hour < 17:
-                    # Check if slot meets all criteria
-                    if (
-                            self._is_time_in_preferred_range(current_time, visit_type) and
-                            self._check_staff_availability(
-                                current_time,
-                                duration + config.padding_before + config.padding_after,
-                                staff_roster,
-                                schedule,
-                                visit_type
-                            )
-                    ):
-                        # Check for conflicts with existing appointments
-                        has_conflict = False
-                        check_time = current_time
-                        while check_time < current_time + timedelta(minutes=duration):
-                            if check_time in schedule:
-                                has_conflict = True
-                                break
-                            check_time += timedelta(minutes=15)
-
-                        if not has_conflict:
-                            potential_slots.append(current_time)
-
-                    current_time += timedelta(minutes=15)
+                day_start = current_date.replace(hour=9, minute=0)
+
+                for offset in slot_offsets:
+                    current_time = day_start + offset
+                    if self._is_slot_open(current_time, duration, staff_roster, schedule, visit_type):
+                        potential_slots.append(current_time)
                 days_checked += 1
 
             current_date += timedelta(days=1)
 
         return potential_slots
 
+    def _is_slot_open(
+            self,
+            time: datetime,
+            duration: int,
+            staff_roster: Dict[str, Staff],
+            schedule: Dict[datetime, TimeSlot],
+            visit_type: VisitType
+    ) -> bool:
+        """Check if a slot meets all criteria for a new appointment of the given duration"""
+        config = self.visit_configs[visit_type]
+        if not (
+                self._is_time_in_preferred_range(time, visit_type) and
+                self._check_staff_availability(
+                    time,
+                    duration + config.padding_before + config.padding_after,
+                    staff_roster,
+                    schedule,
+                    visit_type
+                )
+        ):
+            return False
+
+        # Check for conflicts with existing appointments
+        check_time = time
+        end_time = time + timedelta(minutes=duration)
+        step = timedelta(minutes=15)
+        while check_time < end_time:
+            if check_time in schedule:
+                return False
+            check_time += step
+
+        return True
+
     def get_appointment_details(
             self,
             time: datetime,